@@ -1,22 +1,30 @@
 #Functions were created with AI's help
 import os
 import sys
+import threading
+from collections import OrderedDict
 import networkx as nx
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 # Handle both running as script and as PyInstaller executable
 if getattr(sys, 'frozen', False):
     # Running as compiled executable
-    from utils.fileUtils import get_words_from_file, save_words_to_file, save_similarity_matrix
+    from utils.fileUtils import (get_words_from_file, save_words_to_file, save_similarity_matrix,
+                                 save_sparse_similarity_matrix)
     from utils.translate import translate_words
-    from utils.similarity import compute_similarity
-    from utils.overall_similarity import diagonal_average, add_connection
+    from utils.similarity import compute_similarity, sparse_similarities, similarity_cache_info
+    from utils.overall_similarity import diagonal_average, similarity_average, add_connection
+    from utils.similarity_report import SimilarityReport
+    from utils.pair_cache import similarity_matrix
 else:
     # Running as script
-    from src.utils.fileUtils import get_words_from_file, save_words_to_file, save_similarity_matrix
+    from src.utils.fileUtils import (get_words_from_file, save_words_to_file, save_similarity_matrix,
+                                     save_sparse_similarity_matrix)
     from src.utils.translate import translate_words
-    from src.utils.similarity import compute_similarity
-    from src.utils.overall_similarity import diagonal_average, add_connection
+    from src.utils.similarity import compute_similarity, sparse_similarities, similarity_cache_info
+    from src.utils.overall_similarity import diagonal_average, similarity_average, add_connection
+    from src.utils.similarity_report import SimilarityReport
+    from src.utils.pair_cache import similarity_matrix
 
 
 # Language mapping - full names to language codes
@@ -141,9 +149,84 @@ def select_languages():
         return language_codes
 
 
-def process_word_file(file_path, languages, results_dir):
+def select_sparse_options():
+    """
+    Let user configure sparse similarity output
+    Returns (threshold, top_k); both None means full matrices are written
+    """
+    print("\nSparse output keeps only the most similar word pairs.")
+    print("Leave both values empty to write full similarity matrices.")
+
+    while True:
+        threshold_input = input("\nMinimum similarity (0.0-1.0, empty for none): ").strip()
+        if not threshold_input:
+            threshold = None
+            break
+        try:
+            threshold = float(threshold_input)
+        except ValueError:
+            print("❌ Error: Please enter a number.")
+            continue
+        if 0.0 <= threshold <= 1.0:
+            break
+        print("❌ Error: Similarity must be between 0.0 and 1.0.")
+
+    while True:
+        top_k_input = input("Keep best N pairs per word (empty for all): ").strip()
+        if not top_k_input:
+            top_k = None
+            break
+        if top_k_input.isdigit() and int(top_k_input) > 0:
+            top_k = int(top_k_input)
+            break
+        print("❌ Error: Please enter a positive whole number.")
+
+    if threshold is None and top_k is None:
+        print("\n✅ Full similarity matrices will be saved.")
+    else:
+        print("\n✅ Sparse similarity lists will be saved.")
+    return threshold, top_k
+
+
+# Graph layouts by (nodes, edges); a long-running process redraws the same language graphs
+MAX_CACHED_LAYOUTS = 256
+_LAYOUT_CACHE = OrderedDict()
+_LAYOUT_LOCK = threading.Lock()
+
+
+def save_graph(G, title, graph_path):
+    """Draw a language graph with its edge labels and save it as PNG"""
+    key = (tuple(G.nodes), tuple(G.edges))
+    with _LAYOUT_LOCK:
+        pos = _LAYOUT_CACHE.get(key)
+        if pos is not None:
+            _LAYOUT_CACHE.move_to_end(key)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
+        with _LAYOUT_LOCK:
+            _LAYOUT_CACHE[key] = pos
+            if len(_LAYOUT_CACHE) > MAX_CACHED_LAYOUTS:
+                _LAYOUT_CACHE.popitem(last=False)
+
+    # A standalone Figure instead of pyplot: no global state and no GUI backend,
+    # so graphs can be drawn from the service worker threads
+    fig = Figure(facecolor="w")
+    ax = fig.add_axes((0, 0, 1, 1))
+    nx.draw_networkx(G, pos, ax=ax, with_labels=True, node_color="lightblue", node_size=2000)
+    nx.draw_networkx_edge_labels(G, pos, ax=ax, edge_labels=nx.get_edge_attributes(G, "label"))
+    ax.set_axis_off()
+    ax.set_title(title)
+    fig.savefig(graph_path, format="png", dpi=300, bbox_inches="tight")
+
+
+def process_word_file(file_path, languages, results_dir, threshold=None, top_k=None, report=None,
+                      translate=None, source='auto'):
     """
     Process a single word file and generate translations, similarities, and graph
+    When threshold or top_k is set, only the word pairs passing them are saved (sparse CSV)
+    When report is given, every language pair score is added to it
+    translate(words, lang, source) replaces translate_words when given, e.g. to use a cached translator
+    source is the language code of the word file, 'auto' detects it on every request
     """
     if not os.path.exists(file_path):
         print(f"Error: File '{file_path}' does not exist!")
@@ -157,6 +240,7 @@ def process_word_file(file_path, languages, results_dir):
     print(f"\n=== Processing topic: {topic} ===")
 
     G = nx.Graph()  # Graph will be stored here
+    topic_results = []  # Added to the report only once the whole topic succeeded
 
     try:
         words = get_words_from_file(file_path)
@@ -168,7 +252,8 @@ def process_word_file(file_path, languages, results_dir):
 
         # Translate words to all selected languages
         print("Translating words...")
-        translations = {lang: translate_words(words, lang) for lang in languages}
+        translate = translate or translate_words
+        translations = {lang: translate(words, lang, source) for lang in languages}
 
         # Save translations
         for lang, trans_words in translations.items():
@@ -180,30 +265,40 @@ def process_word_file(file_path, languages, results_dir):
         for i in range(len(languages)):
             for j in range(i + 1, len(languages)):
                 lang1, lang2 = languages[i], languages[j]
-                matrix = [[compute_similarity(w1, w2) for w2 in translations[lang2]]
-                          for w1 in translations[lang1]]
-                save_similarity_matrix(translations[lang1], translations[lang2], matrix,
-                                       f"{results_dir}/similarities/{topic}_{lang1}_{lang2}.csv")
+                if threshold is None and top_k is None:
+                    # Reuses the matrix of the same translations in either language order
+                    matrix = similarity_matrix(translations[lang1], translations[lang2],
+                                               f"{results_dir}/cache/pairs")
+                    save_similarity_matrix(translations[lang1], translations[lang2], matrix,
+                                           f"{results_dir}/similarities/{topic}_{lang1}_{lang2}.csv")
+                    outcome = diagonal_average(matrix) * 100
+                else:
+                    entries = sparse_similarities(translations[lang1], translations[lang2],
+                                                  threshold=threshold, top_k=top_k)
+                    save_sparse_similarity_matrix(translations[lang1], translations[lang2], entries,
+                                                  f"{results_dir}/similarities/{topic}_{lang1}_{lang2}_sparse.csv")
+                    # Only the diagonal is needed for the overall score
+                    diagonal = [compute_similarity(w1, w2)
+                                for w1, w2 in zip(translations[lang1], translations[lang2])]
+                    outcome = similarity_average(diagonal) * 100
+
+                topic_results.append((topic, lang1, lang2, outcome / 100, len(words)))
 
                 # Add connection to graph
-                outcome = diagonal_average(matrix) * 100
                 add_connection(G, lang1, lang2, f"{round(outcome, 2)}%")
 
-        # Draw and save graph
-        pos = nx.spring_layout(G, seed=42)
-        nx.draw(G, pos, with_labels=True, node_color="lightblue", node_size=2000)
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=nx.get_edge_attributes(G, "label"))
-
         # Create title with language names
         lang_names = [list(LANGUAGE_MAP.keys())[list(LANGUAGE_MAP.values()).index(code)].capitalize()
                       for code in languages]
-        plt.title(f"{topic} - Word Similarity ({', '.join(lang_names)})")
 
+        # Draw and save graph
         graph_path = f"{results_dir}/{topic}_similarity_graph.png"
-        plt.savefig(graph_path, format="png", dpi=300, bbox_inches="tight")
-        plt.close()
+        save_graph(G, f"{topic} - Word Similarity ({', '.join(lang_names)})", graph_path)
         print(f"Graph saved to: {graph_path}")
 
+        if report is not None:
+            for result in topic_results:
+                report.add_result(*result)
         return True
 
     except Exception as e:
@@ -213,6 +308,16 @@ def process_word_file(file_path, languages, results_dir):
         return False
 
 
+def save_summary_graph(report, graph_path):
+    """Draw one graph with the weighted average similarity of every language pair in the report"""
+    G = nx.Graph()
+    for row in report.summary():
+        add_connection(G, row["lang1"], row["lang2"], f"{round(row['weighted_average'] * 100, 2)}%")
+
+    topic_count = len({record["topic"] for record in report.records})
+    save_graph(G, f"All topics - Word Similarity ({topic_count} topics)", graph_path)
+
+
 def display_menu():
     """Display the main menu"""
     print("\n" + "=" * 60)
@@ -222,7 +327,8 @@ def display_menu():
     print("1. Analyze a single file")
     print("2. Analyze all files in a directory")
     print("3. Change language selection")
-    print("4. Exit")
+    print("4. Configure sparse output")
+    print("5. Exit")
 
 
 def get_file_path():
@@ -238,7 +344,7 @@ def get_directory_path():
     return dir_path.strip('"').strip("'")
 
 
-def process_directory(dir_path, languages, results_dir):
+def process_directory(dir_path, languages, results_dir, threshold=None, top_k=None, source='auto'):
     """Process all .txt files in a directory"""
     if not os.path.exists(dir_path):
         print(f"Error: Directory '{dir_path}' does not exist!")
@@ -257,9 +363,26 @@ def process_directory(dir_path, languages, results_dir):
     print(f"\nFound {len(txt_files)} .txt file(s). Processing...")
 
     success_count = 0
+    report = SimilarityReport()
+    cache_before = similarity_cache_info()
     for filename in txt_files:
         file_path = os.path.join(dir_path, filename)
-        if process_word_file(file_path, languages, results_dir):
+        if process_word_file(file_path, languages, results_dir, threshold, top_k, report, source=source):
             success_count += 1
 
-    print(f"\n✅ Successfully processed {success_count}/{len(txt_files)} files!")
\ No newline at end of file
+    print(f"\n✅ Successfully processed {success_count}/{len(txt_files)} files!")
+    # Only the lookups of this run, not those of earlier runs in the same session
+    cache_after = similarity_cache_info()
+    hits = cache_after["hits"] - cache_before["hits"]
+    lookups = hits + cache_after["misses"] - cache_before["misses"]
+    if lookups:
+        print(f"Word pair cache hit rate: {hits / lookups * 100:.1f}%")
+
+    if report.records:
+        # One overall answer for the whole run, next to the per-topic graphs
+        report.save_csv(f"{results_dir}/overall_similarity.csv")
+        report.save_json(f"{results_dir}/overall_similarity.json")
+        graph_path = f"{results_dir}/overall_similarity_graph.png"
+        save_summary_graph(report, graph_path)
+        print(f"Overall similarity saved to: {results_dir}/overall_similarity.csv")
+        print(f"Graph saved to: {graph_path}")
\ No newline at end of file
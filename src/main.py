@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 
@@ -11,8 +12,12 @@ if getattr(sys, 'frozen', False):
         display_menu,
         get_file_path,
         get_directory_path,
-        process_directory
+        process_directory,
+        select_sparse_options,
+        LANGUAGE_MAP
     )
+    from service import run_server
+    from utils.similarity import enable_persistent_cache
     # Use the directory where the .exe is located
     project_root = os.path.dirname(sys.executable)
 else:
@@ -23,8 +28,12 @@ else:
         display_menu,
         get_file_path,
         get_directory_path,
-        process_directory
+        process_directory,
+        select_sparse_options,
+        LANGUAGE_MAP
     )
+    from src.service import run_server
+    from src.utils.similarity import enable_persistent_cache
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 results_dir = os.path.join(project_root, "results")
@@ -32,9 +41,10 @@ results_dir = os.path.join(project_root, "results")
 # Create necessary directories
 os.makedirs(f"{results_dir}/translations", exist_ok=True)
 os.makedirs(f"{results_dir}/similarities", exist_ok=True)
+os.makedirs(f"{results_dir}/cache", exist_ok=True)
 
 
-def main():
+def main(source='auto'):
     print("=" * 60)
     print("Word Similarity Analyzer - Levenshtein Method")
     print("=" * 60)
@@ -42,18 +52,20 @@ def main():
     # Step 1: Language Selection
     print("\nStep 1: Language Selection")
     languages = select_languages()
+    # Full similarity matrices until sparse output is configured
+    threshold, top_k = None, None
 
     # Main loop
     while True:
         display_menu()
 
-        choice = input("\nEnter your choice (1-4): ").strip()
+        choice = input("\nEnter your choice (1-5): ").strip()
 
         if choice == "1":
             # Analyze single file
             file_path = get_file_path()
 
-            if process_word_file(file_path, languages, results_dir):
+            if process_word_file(file_path, languages, results_dir, threshold, top_k, source=source):
                 print("\n✅ File processed successfully!")
             else:
                 print("\n❌ Failed to process file.")
@@ -61,7 +73,7 @@ def main():
         elif choice == "2":
             # Analyze directory
             dir_path = get_directory_path()
-            process_directory(dir_path, languages, results_dir)
+            process_directory(dir_path, languages, results_dir, threshold, top_k, source)
 
         elif choice == "3":
             # Change language selection
@@ -71,13 +83,43 @@ def main():
             languages = select_languages()
 
         elif choice == "4":
+            # Configure sparse output
+            threshold, top_k = select_sparse_options()
+
+        elif choice == "5":
             # Exit
             print("\nExiting. Goodbye!")
             break
 
         else:
-            print("\nInvalid choice. Please enter 1, 2, 3, or 4.")
+            print("\nInvalid choice. Please enter 1, 2, 3, 4, or 5.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Word Similarity Analyzer - Levenshtein Method")
+    parser.add_argument("--source", default="auto", choices=["auto", *sorted(LANGUAGE_MAP.values())],
+                        metavar="CODE",
+                        help="language code of the word files, skips language detection (default: auto)")
+    parser.add_argument("--serve", action="store_true",
+                        help="run as a local JSON API service instead of the interactive menu")
+    parser.add_argument("--host", default="127.0.0.1", help="service interface (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="service port (default: 8765)")
+    parser.add_argument("--data-dir", default=os.path.join(project_root, "data"),
+                        help="the only directory whose word files the service processes (default: data)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="number of jobs the service processes at the same time (default: 4)")
+    parser.add_argument("--persistent-cache", action="store_true",
+                        help="reuse word pair similarities of earlier runs, "
+                             "kept in results/cache/similarities.sqlite3")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.persistent_cache:
+        # Word pair similarities computed by earlier runs are reused
+        enable_persistent_cache(f"{results_dir}/cache/similarities.sqlite3")
+    if args.serve:
+        run_server(results_dir, args.host, args.port, args.workers, args.source, args.data_dir)
+    else:
+        main(args.source)
\ No newline at end of file
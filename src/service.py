@@ -0,0 +1,244 @@
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Handle both running as script and as PyInstaller executable
+if getattr(sys, 'frozen', False):
+    # Running as compiled executable
+    from displayUtils import LANGUAGE_MAP, process_word_file
+    from utils.translate import translate_words, TranslationError
+    from utils.similarity import compute_similarity, similarity_cache_info
+    from utils.overall_similarity import similarity_average
+else:
+    # Running as script
+    from src.displayUtils import LANGUAGE_MAP, process_word_file
+    from src.utils.translate import translate_words, TranslationError
+    from src.utils.similarity import compute_similarity, similarity_cache_info
+    from src.utils.overall_similarity import similarity_average
+
+# (word, source, language) translations remembered (least recently used dropped first)
+MAX_CACHED_TRANSLATIONS = 100_000
+# Most languages in one request, as in the interactive language selection
+MAX_LANGUAGES = 4
+
+
+class AnalysisService:
+    """
+    Long-running analysis backend that keeps translations warm between requests.
+
+    Jobs are queued on a pool of worker threads. The last MAX_CACHED_TRANSLATIONS
+    (word, language) translations are remembered, so repeated word lists only
+    pay for the similarity computation. A failed translation
+    request raises TranslationError and nothing is remembered, so the words
+    are requested again next time instead of being scored untranslated.
+
+    Args:
+        results_dir (str): Directory where processed word files are saved
+        workers (int, optional): Number of jobs processed at the same time. Defaults to 4
+        translate (callable, optional): translate(words, lang, source) backend, raising on failure.
+                                        Defaults to translate_words with strict=True
+        source (str, optional): Source language used when a request gives none. Defaults to 'auto'
+        data_dir (str, optional): Only word files inside this directory can be processed.
+                                  Defaults to None (file processing disabled)
+
+    Example:
+        >>> service = AnalysisService("results", translate=lambda words, lang, source: words)
+        >>> service.submit(service.compare_words, ["cat", "dog"], ["en", "pl"]).result()
+        {'translations': {...}, 'pairs': [{'lang1': 'en', 'lang2': 'pl', 'score': 1.0, ...}]}
+    """
+
+    def __init__(self, results_dir, workers=4, translate=None, source='auto', data_dir=None):
+        self.results_dir = results_dir
+        self.data_dir = data_dir
+        self.workers = workers
+        self.source = source
+        self._translate_backend = translate or partial(translate_words, strict=True)
+        self._translations = OrderedDict()
+        self._translations_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(self, job, *args):
+        """Queue a job; returns a Future holding its result"""
+        return self._executor.submit(job, *args)
+
+    def shutdown(self):
+        """Finish queued jobs and stop the workers"""
+        self._executor.shutdown(wait=True)
+
+    def translate(self, words, lang, source=None):
+        """Translate words, asking the backend only for words not translated before (errors are not cached)"""
+        source = source or self.source
+        found = {}
+        with self._translations_lock:
+            for w in words:
+                key = (w, source, lang)
+                if key in self._translations:
+                    self._translations.move_to_end(key)
+                    found[w] = self._translations[key]
+        missing = list(dict.fromkeys(w for w in words if w not in found))
+        if missing:
+            translated = self._translate_backend(missing, lang, source)
+            with self._translations_lock:
+                for word, translation in zip(missing, translated):
+                    found[word] = translation
+                    self._translations[(word, source, lang)] = translation
+                    if len(self._translations) > MAX_CACHED_TRANSLATIONS:
+                        self._translations.popitem(last=False)
+        return [found[w] for w in words]
+
+    def compare_words(self, words, languages, source=None):
+        """
+        Translate a word list and score every pair of languages.
+
+        Args:
+            words (list): Words to translate and compare
+            languages (list): Language codes, 2 to MAX_LANGUAGES
+            source (str, optional): Language code of the words. Defaults to the service source
+
+        Returns:
+            dict: Translations per language and, for each language pair, the
+                  overall score with the similarity of every translated word
+        """
+        _validate_languages(languages, source)
+        if not words:
+            raise ValueError("No words given")
+
+        translations = {lang: self.translate(words, lang, source) for lang in languages}
+        pairs = []
+        for i in range(len(languages)):
+            for j in range(i + 1, len(languages)):
+                lang1, lang2 = languages[i], languages[j]
+                word_scores = [compute_similarity(w1, w2)
+                               for w1, w2 in zip(translations[lang1], translations[lang2])]
+                pairs.append({
+                    "lang1": lang1,
+                    "lang2": lang2,
+                    "score": similarity_average(word_scores),
+                    "word_scores": word_scores,
+                })
+        return {"translations": translations, "pairs": pairs}
+
+    def process_file(self, file_path, languages, source=None):
+        """Run process_word_file on a word file inside data_dir, saving results to results_dir"""
+        _validate_languages(languages, source)
+        file_path = self._data_file(file_path)
+        return {"success": process_word_file(file_path, languages, self.results_dir,
+                                             translate=self.translate, source=source or self.source)}
+
+    def _data_file(self, file_path):
+        # Clients must not make the service read (and send to the translator) arbitrary files
+        if self.data_dir is None:
+            raise PermissionError("File processing is disabled: no data directory configured")
+        if not isinstance(file_path, str) or not file_path:
+            raise ValueError("No file given")
+        data_dir = os.path.realpath(self.data_dir)
+        resolved = os.path.realpath(os.path.join(data_dir, file_path))
+        if os.path.commonpath([data_dir, resolved]) != data_dir:
+            raise PermissionError(f"File is outside the data directory: {file_path}")
+        return resolved
+
+
+def _validate_languages(languages, source=None):
+    if source not in (None, 'auto') and source not in LANGUAGE_MAP.values():
+        raise ValueError(f"Unknown source language code: {source}")
+    if not isinstance(languages, list) or len(languages) < 2:
+        raise ValueError("Please select at least 2 languages")
+    if len(languages) > MAX_LANGUAGES:
+        raise ValueError(f"Please select maximum {MAX_LANGUAGES} languages")
+    unknown = [code for code in languages if code not in LANGUAGE_MAP.values()]
+    if unknown:
+        raise ValueError(f"Unknown language code(s): {', '.join(map(str, unknown))}")
+    if len(languages) != len(set(languages)):
+        raise ValueError("The same language was selected multiple times")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    # Set on the subclass created by create_server
+    service = None
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "workers": self.service.workers,
+                                  "similarity_cache": similarity_cache_info()})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/similarity":
+                future = self.service.submit(self.service.compare_words,
+                                             body.get("words"), body.get("languages"), body.get("source"))
+            elif self.path == "/process":
+                future = self.service.submit(self.service.process_file,
+                                             body.get("file"), body.get("languages"), body.get("source"))
+            else:
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+                return
+            self._send_json(200, future.result())
+        except PermissionError as e:
+            self._send_json(403, {"error": str(e)})
+        except TranslationError as e:
+            # The translation service failed, not the request
+            self._send_json(502, {"error": str(e)})
+        except (ValueError, TypeError) as e:
+            # json.JSONDecodeError is a ValueError as well
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def _send_json(self, status, data):
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Keep the console for the analysis output
+        pass
+
+
+def create_server(service, host="127.0.0.1", port=8765):
+    """
+    Create an HTTP server exposing the service as a JSON API.
+
+    Endpoints:
+        GET  /health     -> {"status": "ok", "workers": n, "similarity_cache": similarity_cache_info()}
+        POST /similarity {"words": [...], "languages": [...], "source": "en"} -> result of compare_words
+        POST /process    {"file": path, "languages": [...], "source": "en"}   -> {"success": bool}
+        "source" is optional and defaults to the service source language
+        "file" must be inside the service data directory (relative paths start there), otherwise 403
+        A failed translation request is answered with 502 instead of untranslated scores
+
+    Args:
+        service (AnalysisService): Service handling the requests
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1"
+        port (int, optional): Port to listen on, 0 picks a free one. Defaults to 8765
+
+    Returns:
+        ThreadingHTTPServer: Server ready for serve_forever()
+    """
+    handler = type("RequestHandler", (_RequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def run_server(results_dir, host="127.0.0.1", port=8765, workers=4, source='auto', data_dir=None):
+    """Serve the analysis API until interrupted"""
+    service = AnalysisService(results_dir, workers=workers, source=source, data_dir=data_dir)
+    server = create_server(service, host, port)
+    print(f"Analysis service listening on http://{host}:{server.server_address[1]} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping service...")
+    finally:
+        server.server_close()
+        service.shutdown()
@@ -66,4 +66,32 @@ def save_similarity_matrix(words1, words2, matrix, file_path):
         writer = csv.writer(f)
         writer.writerow([""] + words2)  # nagłówki kolumn
         for w1, row in zip(words1, matrix):
-            writer.writerow([w1] + [f"{v:.2f}" for v in row])
\ No newline at end of file
+            writer.writerow([w1] + [f"{v:.2f}" for v in row])
+
+def save_sparse_similarity_matrix(words1, words2, entries, file_path):
+    """
+    Save a sparse (COO-style) similarity matrix to a CSV file.
+    Only the given entries are written, one pair per line.
+
+    Args:
+        words1 (list): List of words for rows
+        words2 (list): List of words for columns
+        entries (list): (row_index, column_index, similarity) tuples
+        file_path (str): Destination CSV file path
+
+    Returns:
+        None
+
+    Example:
+        >>> words_en = ['dog', 'cat']
+        >>> words_es = ['perro', 'gato']
+        >>> entries = [(0, 0, 0.85), (1, 1, 0.91)]
+        >>> save_sparse_similarity_matrix(words_en, words_es, entries,
+        ...                               "results/similarities/animals_en_es_sparse.csv")
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["row", "col", "word1", "word2", "similarity"])
+        for i, j, v in entries:
+            writer.writerow([i, j, words1[i], words2[j], f"{v:.2f}"])
@@ -46,4 +46,22 @@ def diagonal_average(matrix):
     n = min(len(matrix), len(matrix[0]))  # works for non-square matrices
     diagonal = [matrix[i][i] for i in range(n)]
 
-    return sum(diagonal) / len(diagonal) if diagonal else 0
+    return similarity_average(diagonal)
+
+
+def similarity_average(similarities):
+    """
+       Calculate the average of word similarities, e.g. the diagonal of a matrix.
+       Used directly when only the diagonal was computed.
+
+       Args:
+           similarities (list): Similarity values
+
+       Returns:
+           float: Average of the values, or 0 if the list is empty
+
+       Example:
+           >>> similarity_average([1.0, 0.9])
+           0.95
+       """
+    return sum(similarities) / len(similarities) if similarities else 0
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# Handle both running as script and as PyInstaller executable
+if getattr(sys, 'frozen', False):
+    # Running as compiled executable
+    from utils.similarity import compute_similarity
+else:
+    # Running as script
+    from src.utils.similarity import compute_similarity
+
+# Matrices kept in memory; older ones are still found on disk when a cache directory is used
+MAX_MEMORY_MATRICES = 256
+# Matrices kept in a cache directory; the least recently used files are deleted beyond this
+MAX_STORED_MATRICES = 1000
+
+_matrices = OrderedDict()
+_lock = threading.Lock()
+
+
+def word_list_hash(words):
+    """
+    Hash the content of a word list, so equal translations share one key.
+
+    Args:
+        words (list): List of words
+
+    Returns:
+        str: Hex digest identifying the word list and its order
+
+    Example:
+        >>> word_list_hash(["kot", "pies"]) == word_list_hash(["kot", "pies"])
+        True
+    """
+    data = json.dumps(words, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def similarity_matrix(words1, words2, cache_dir=None):
+    """
+    Compute the word-by-word similarity matrix, reusing earlier results of the same pair.
+
+    Similarity is symmetric, so each pair of word lists is computed once in a
+    canonical order (by content hash) and served transposed when asked the
+    other way round. Results are kept in memory and, when cache_dir is given,
+    stored there as JSON to be reused by later runs (at most
+    MAX_STORED_MATRICES files, least recently used deleted first).
+
+    Args:
+        words1 (list): List of words for rows
+        words2 (list): List of words for columns
+        cache_dir (str, optional): Directory for stored matrices. Defaults to None (memory only)
+
+    Returns:
+        list of lists: matrix[i][j] is the similarity of words1[i] and words2[j]
+
+    Example:
+        >>> matrix = similarity_matrix(['kot', 'pies'], ['gato', 'perro'])
+        >>> similarity_matrix(['gato', 'perro'], ['kot', 'pies']) == [list(r) for r in zip(*matrix)]
+        True
+    """
+    hash1, hash2 = word_list_hash(words1), word_list_hash(words2)
+    swapped = hash1 > hash2
+    key = f"{hash2}_{hash1}" if swapped else f"{hash1}_{hash2}"
+
+    matrix = _load(key, cache_dir)
+    if matrix is None:
+        rows, cols = (words2, words1) if swapped else (words1, words2)
+        matrix = [[compute_similarity(w1, w2) for w2 in cols] for w1 in rows]
+        _store(key, matrix, cache_dir)
+
+    if swapped:
+        return [list(column) for column in zip(*matrix)]
+    return [list(row) for row in matrix]
+
+
+def clear_memory_cache():
+    """Forget the matrices kept in memory (stored files are left untouched)"""
+    with _lock:
+        _matrices.clear()
+
+
+def clear_stored_matrices(cache_dir):
+    """
+    Delete every matrix stored in a cache directory.
+
+    Args:
+        cache_dir (str): Directory passed to similarity_matrix
+
+    Returns:
+        int: Number of deleted files
+
+    Example:
+        >>> clear_stored_matrices("results/cache/pairs")
+        12
+    """
+    deleted = 0
+    for file_path in _stored_files(cache_dir):
+        try:
+            os.remove(file_path)
+            deleted += 1
+        except OSError:
+            pass
+    return deleted
+
+
+def _stored_files(cache_dir):
+    if not os.path.isdir(cache_dir):
+        return []
+    return [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".json")]
+
+
+def _evict_stored(cache_dir):
+    files = _stored_files(cache_dir)
+    if len(files) <= MAX_STORED_MATRICES:
+        return
+
+    def last_used(file_path):
+        try:
+            return os.path.getmtime(file_path)
+        except OSError:
+            return 0
+
+    files.sort(key=last_used)
+    for file_path in files[:len(files) - MAX_STORED_MATRICES]:
+        try:
+            os.remove(file_path)
+        except OSError:
+            # Already deleted by another worker
+            pass
+
+
+def _load(key, cache_dir):
+    with _lock:
+        if key in _matrices:
+            _matrices.move_to_end(key)
+            return _matrices[key]
+
+    if cache_dir is None:
+        return None
+    file_path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            matrix = json.load(f)
+        # Mark as recently used, so eviction deletes other files first
+        os.utime(file_path)
+    except (OSError, ValueError):
+        return None
+    _remember(key, matrix)
+    return matrix
+
+
+def _store(key, matrix, cache_dir):
+    _remember(key, matrix)
+    if cache_dir is None:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    file_path = os.path.join(cache_dir, f"{key}.json")
+    # Write to a temporary file first, so a reader never sees half a matrix
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(matrix, f)
+    os.replace(tmp_path, file_path)
+    _evict_stored(cache_dir)
+
+
+def _remember(key, matrix):
+    with _lock:
+        _matrices[key] = matrix
+        _matrices.move_to_end(key)
+        while len(_matrices) > MAX_MEMORY_MATRICES:
+            _matrices.popitem(last=False)
@@ -1,14 +1,164 @@
+import atexit
+import heapq
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
 import textdistance
 
+# Word pairs remembered in memory (least recently used pairs are dropped first)
+MAX_CACHED_PAIRS = 100_000
+# Pairs collected before they are written to the persistent cache
+PERSISTENT_BATCH_SIZE = 1000
+# Pairs kept in the persistent cache; the oldest written pairs are deleted beyond this
+MAX_PERSISTENT_PAIRS = 1_000_000
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+_stats = {"hits": 0, "persistent_hits": 0, "misses": 0}
+# The persistent tier has its own lock, so disk lookups do not block the memory cache
+_persistent = None
+_pending = []
+_persistent_lock = threading.Lock()
+
+
+def _pair_key(word1, word2):
+    if isinstance(word1, str) and isinstance(word2, str):
+        # Similarity is symmetric, so both orders share one entry
+        if word2 < word1:
+            word1, word2 = word2, word1
+        return sys.intern(word1), sys.intern(word2)
+    # Other sequences are keyed as they are; unhashable ones (e.g. lists) are not cached
+    try:
+        hash((word1, word2))
+    except TypeError:
+        return None
+    return word1, word2
+
+
+def _persistable(key):
+    return isinstance(key[0], str) and isinstance(key[1], str)
+
+
+def _remember(key, score):
+    _memo[key] = score
+    if len(_memo) > MAX_CACHED_PAIRS:
+        _memo.popitem(last=False)
+
+
+def _cached_score(key):
+    with _memo_lock:
+        score = _memo.get(key)
+        if score is not None:
+            _memo.move_to_end(key)
+            _stats["hits"] += 1
+            return score
+
+    row = None
+    if _persistable(key):
+        with _persistent_lock:
+            if _persistent is not None:
+                row = _persistent.execute("SELECT score FROM similarities WHERE word1 = ? AND word2 = ?",
+                                          key).fetchone()
+
+    with _memo_lock:
+        if row is None:
+            _stats["misses"] += 1
+            return None
+        _stats["hits"] += 1
+        _stats["persistent_hits"] += 1
+        _remember(key, row[0])
+        return row[0]
+
+
+def _store_score(key, score):
+    with _memo_lock:
+        _remember(key, score)
+    if _persistable(key):
+        with _persistent_lock:
+            if _persistent is not None:
+                _pending.append((*key, score))
+                if len(_pending) >= PERSISTENT_BATCH_SIZE:
+                    _flush_pending()
+
+
+def _max_distance(min_score, maximum):
+    # Largest edit distance whose score 1 - distance / maximum still reaches
+    # min_score, computed with the same float operations as the score itself
+    distance = min(maximum, max(-1, int((1 - min_score) * maximum)))
+    while distance >= 0 and 1 - distance / maximum < min_score:
+        distance -= 1
+    while distance < maximum and 1 - (distance + 1) / maximum >= min_score:
+        distance += 1
+    return distance
+
+
+def _bounded_levenshtein(word1, word2, max_distance):
+    """
+    Levenshtein distance, or None as soon as it is known to exceed max_distance.
+
+    Only the diagonal band |i - j| <= max_distance of the DP table is filled
+    (Ukkonen), so the cost is O(max_distance * min(len(word1), len(word2))).
+    """
+    if len(word1) > len(word2):
+        word1, word2 = word2, word1
+    n, m = len(word1), len(word2)
+    if m - n > max_distance:
+        return None
+
+    over = max_distance + 1  # any value above the limit
+    # Two rows are reused for the whole table; a row only holds meaningful
+    # values inside its band, cells left over from earlier rows are never read
+    prev = [j if j <= max_distance else over for j in range(m + 1)]
+    cur = [over] * (m + 1)
+    for i in range(1, n + 1):
+        lo, hi = max(1, i - max_distance), min(m, i + max_distance)
+        cur[0] = i if i <= max_distance else over
+        # Band edges read by this row and the next one
+        if lo > 1:
+            cur[lo - 1] = over
+        if hi < m:
+            cur[hi + 1] = over
+        # Smallest distance any path through this row can still end with
+        best = cur[0] + abs(m - (n - i))
+        ch = word1[i - 1]
+        for j in range(lo, hi + 1):
+            value = prev[j - 1] if word2[j - 1] == ch else prev[j - 1] + 1
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if cur[j - 1] + 1 < value:
+                value = cur[j - 1] + 1
+            if value > max_distance:
+                value = over
+            cur[j] = value
+            remaining = value + abs((m - j) - (n - i))
+            if remaining < best:
+                best = remaining
+        if best > max_distance:
+            return None
+        prev, cur = cur, prev
+
+    return prev[m] if prev[m] <= max_distance else None
+
+
 """
    Calculate normalized similarity between two words using Levenshtein distance.
+   Results are memoized per word pair (in memory, and in the persistent cache when enabled).
+
+   With min_score, the caller only needs pairs reaching that score: the edit
+   distance is computed in a band around the diagonal and abandoned as soon as
+   the score can no longer reach min_score. Scores that are returned are
+   exactly the ones computed without min_score.
 
    Args:
        word1 (str): First word
        word2 (str): Second word
+       min_score (float, optional): Lowest score of interest. Defaults to None (always compute)
 
    Returns:
-       float: Similarity score between 0.0 (completely different) and 1.0 (identical)
+       float: Similarity score between 0.0 (completely different) and 1.0 (identical),
+              or None when the score is below min_score
 
    Example:
        >>> compute_similarity("cat", "cat")
@@ -17,6 +167,181 @@ import textdistance
        0.0
        >>> compute_similarity("kitten", "sitting")
        0.571  # approximately
+       >>> compute_similarity("kitten", "sitting", min_score=0.8) is None
+       True
    """
-def compute_similarity(word1, word2):
-    return textdistance.levenshtein.normalized_similarity(word1, word2)
\ No newline at end of file
+def compute_similarity(word1, word2, min_score=None):
+    key = _pair_key(word1, word2)
+    score = _cached_score(key) if key is not None else None
+    if score is None:
+        maximum = max(len(word1), len(word2))
+        if min_score is None or maximum == 0:
+            score = textdistance.levenshtein.normalized_similarity(word1, word2)
+        else:
+            distance = _bounded_levenshtein(word1, word2, _max_distance(min_score, maximum))
+            if distance is None:
+                return None
+            score = 1 - distance / maximum
+        if key is not None:
+            _store_score(key, score)
+
+    if min_score is not None and score < min_score:
+        return None
+    return score
+
+def similarity_cache_info():
+    """
+    Get statistics of the word pair similarity cache.
+
+    Returns:
+        dict: hits (including persistent_hits), persistent_hits, misses,
+              size and max_size of the memory cache, and hit_rate (0.0-1.0)
+
+    Example:
+        >>> similarity_cache_info()
+        {'hits': 950, 'persistent_hits': 120, 'misses': 50, 'size': 880, 'max_size': 100000, 'hit_rate': 0.95}
+    """
+    with _memo_lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "size": len(_memo),
+            "max_size": MAX_CACHED_PAIRS,
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def clear_similarity_cache():
+    """Forget the word pairs kept in memory and reset the statistics (the persistent cache is kept)"""
+    with _memo_lock:
+        _memo.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def enable_persistent_cache(file_path):
+    """
+    Keep computed word pair similarities in an SQLite file, shared between runs.
+    The file holds at most MAX_PERSISTENT_PAIRS pairs, the oldest written pairs
+    are deleted first.
+
+    Args:
+        file_path (str): Path of the SQLite database, created if missing
+
+    Returns:
+        None
+
+    Example:
+        >>> enable_persistent_cache("results/cache/similarities.sqlite3")
+    """
+    global _persistent
+    disable_persistent_cache()
+    connection = sqlite3.connect(file_path, check_same_thread=False)
+    connection.execute("CREATE TABLE IF NOT EXISTS similarities "
+                       "(word1 TEXT, word2 TEXT, score REAL, PRIMARY KEY (word1, word2))")
+    with _persistent_lock:
+        _persistent = connection
+
+
+def disable_persistent_cache():
+    """Write pending pairs to the persistent cache and close it"""
+    global _persistent
+    with _persistent_lock:
+        if _persistent is None:
+            return
+        _flush_pending()
+        _persistent.close()
+        _persistent = None
+
+
+# Pairs still waiting for a batch write are saved when the program exits
+atexit.register(disable_persistent_cache)
+
+
+def _flush_pending():
+    # Caller holds _persistent_lock
+    _persistent.executemany("INSERT OR REPLACE INTO similarities VALUES (?, ?, ?)", _pending)
+    # Rows get increasing rowids as they are written, so the lowest ones are the oldest
+    _persistent.execute("DELETE FROM similarities WHERE rowid IN (SELECT rowid FROM similarities "
+                        "ORDER BY rowid LIMIT max(0, (SELECT COUNT(*) FROM similarities) - ?))",
+                        (MAX_PERSISTENT_PAIRS,))
+    _persistent.commit()
+    _pending.clear()
+
+
+def _char_histogram(word):
+    counts = {}
+    for ch in word:
+        counts[ch] = counts.get(ch, 0) + 1
+    return counts
+
+
+def _distance_lower_bound(word1, word2, hist1, hist2):
+    # Every edit fixes at most one surplus character on each side, so the
+    # Levenshtein distance is at least the larger one-sided histogram surplus
+    # (which is itself never smaller than the length difference).
+    surplus1 = sum(max(0, n - hist2.get(ch, 0)) for ch, n in hist1.items())
+    surplus2 = surplus1 - len(word1) + len(word2)
+    return max(surplus1, surplus2)
+
+
+def _can_qualify(score, threshold, floor):
+    # floor is the current k-th best score of a full top-k row; equal scores
+    # lose the tie to the earlier column already kept
+    if threshold is not None and score < threshold:
+        return False
+    return floor is None or score > floor
+
+
+def sparse_similarities(words1, words2, threshold=None, top_k=None):
+    """
+    Compute only the similarity pairs worth keeping, in COO form.
+
+    A pair is kept when its score is at least ``threshold`` and, if ``top_k``
+    is given, it is among the ``top_k`` best scores of its row (ties go to the
+    lower column index). Pairs whose length difference or character histograms
+    show they cannot qualify are skipped without computing the edit distance.
+
+    Args:
+        words1 (list): List of words for rows
+        words2 (list): List of words for columns
+        threshold (float, optional): Minimum similarity to keep. Defaults to None (no minimum)
+        top_k (int, optional): Maximum number of pairs kept per row. Defaults to None (no limit)
+
+    Returns:
+        list: (row_index, column_index, similarity) tuples ordered by row, then column
+
+    Example:
+        >>> sparse_similarities(["cat", "dog"], ["gato", "perro"], threshold=0.5)
+        [(0, 0, 0.5)]
+    """
+    if top_k is not None and top_k <= 0:
+        return []
+
+    hists2 = [_char_histogram(w2) for w2 in words2]
+    entries = []
+    for i, w1 in enumerate(words1):
+        hist1 = _char_histogram(w1)
+        row = []  # min-heap of (score, -column): the pair that goes first sits on top
+        for j, w2 in enumerate(words2):
+            floor = row[0][0] if top_k is not None and len(row) == top_k else None
+            maximum = max(len(w1), len(w2))
+            if maximum:
+                # Cheap length bound first, histogram bound only if that passes
+                if not _can_qualify(1 - abs(len(w1) - len(w2)) / maximum, threshold, floor):
+                    continue
+                bound = 1 - _distance_lower_bound(w1, w2, hist1, hists2[j]) / maximum
+                if not _can_qualify(bound, threshold, floor):
+                    continue
+
+            # Pairs below both limits are dropped anyway, so their distance may be abandoned early
+            cutoff = max((x for x in (threshold, floor) if x is not None), default=None)
+            score = compute_similarity(w1, w2, min_score=cutoff)
+            if score is None or not _can_qualify(score, threshold, floor):
+                continue
+            if floor is None:
+                heapq.heappush(row, (score, -j))
+            else:
+                heapq.heapreplace(row, (score, -j))
+        entries.extend(sorted((i, -neg_j, score) for score, neg_j in row))
+    return entries
@@ -0,0 +1,149 @@
+import csv
+import json
+import math
+import os
+
+# Two-sided 95% t quantiles by degrees of freedom; above 30 the normal 1.96 is used
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+Z_95 = 1.96
+
+
+def _t_95(degrees_of_freedom):
+    # Fractional degrees of freedom are rounded down, which widens the interval
+    df = max(1, int(degrees_of_freedom))
+    return T_95[df - 1] if df <= len(T_95) else Z_95
+
+
+class SimilarityReport:
+    """
+    Collect per-topic language similarities of a run and aggregate them per language pair.
+
+    Every result is folded into running sums as soon as it is added, so the
+    overall averages are available at any point without re-reading the
+    per-topic similarity CSVs. Language pairs are stored in alphabetical
+    order, so ("pl", "es") and ("es", "pl") count as the same pair.
+
+    Example:
+        >>> report = SimilarityReport()
+        >>> report.add_result("animals", "en", "es", 0.42, 40)
+        >>> report.add_result("fruits", "es", "en", 0.50, 36)
+        >>> report.summary()[0]["weighted_average"]
+        0.4842...  # (0.42 * 40 + 0.50 * 36) / 76
+    """
+
+    def __init__(self):
+        self.records = []
+        self._pairs = {}
+
+    def add_result(self, topic, lang1, lang2, score, word_count):
+        """
+        Add the overall similarity of one language pair for one topic.
+
+        Args:
+            topic (str): Topic name (word file name without extension)
+            lang1 (str): First language code
+            lang2 (str): Second language code
+            score (float): Overall similarity between 0.0 and 1.0
+            word_count (int): Number of words compared, used as the weight
+
+        Returns:
+            None
+        """
+        self.records.append({
+            "topic": topic,
+            "lang1": lang1,
+            "lang2": lang2,
+            "score": score,
+            "word_count": word_count,
+        })
+
+        pair = tuple(sorted((lang1, lang2)))
+        stats = self._pairs.setdefault(pair, {
+            "topics": 0,
+            "words": 0,
+            "weighted_sum": 0.0,
+            "weighted_squares": 0.0,
+            "squared_weights": 0,
+        })
+        stats["topics"] += 1
+        stats["words"] += word_count
+        stats["weighted_sum"] += word_count * score
+        stats["weighted_squares"] += word_count * score * score
+        stats["squared_weights"] += word_count * word_count
+
+    def summary(self):
+        """
+        Aggregate the collected results per language pair.
+
+        The average of each pair is weighted by word count. The 95% confidence
+        interval uses the unbiased weighted variance of the topic scores, the
+        effective (Kish) number of topics n_eff and a t quantile with n_eff - 1
+        degrees of freedom; it is None when fewer than two topics contributed
+        to the pair.
+
+        Returns:
+            list: One dict per language pair, ranked from most to least similar
+        """
+        rows = []
+        for (lang1, lang2), stats in self._pairs.items():
+            words = stats["words"]
+            average = stats["weighted_sum"] / words if words else 0
+            ci_low = ci_high = None
+            effective_topics = words * words / stats["squared_weights"] if words else 0
+            if stats["topics"] > 1 and effective_topics > 1:
+                variance = max(0.0, stats["weighted_squares"] / words - average * average)
+                # Bessel-style correction of the weighted variance
+                variance *= effective_topics / (effective_topics - 1)
+                margin = _t_95(effective_topics - 1) * math.sqrt(variance / effective_topics)
+                ci_low, ci_high = max(0.0, average - margin), min(1.0, average + margin)
+            rows.append({
+                "lang1": lang1,
+                "lang2": lang2,
+                "topics": stats["topics"],
+                "words": words,
+                "weighted_average": average,
+                "ci_low": ci_low,
+                "ci_high": ci_high,
+            })
+
+        rows.sort(key=lambda row: (-row["weighted_average"], row["lang1"], row["lang2"]))
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+        return rows
+
+    def save_csv(self, file_path):
+        """
+        Save the ranked per-pair summary to a CSV file.
+
+        Args:
+            file_path (str): Destination CSV file path
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["rank", "lang1", "lang2", "topics", "words",
+                             "weighted_average", "ci_low", "ci_high"])
+            for row in self.summary():
+                writer.writerow([row["rank"], row["lang1"], row["lang2"], row["topics"], row["words"],
+                                 f"{row['weighted_average']:.4f}",
+                                 "" if row["ci_low"] is None else f"{row['ci_low']:.4f}",
+                                 "" if row["ci_high"] is None else f"{row['ci_high']:.4f}"])
+
+    def save_json(self, file_path):
+        """
+        Save every per-topic result together with the per-pair summary to a JSON file.
+
+        Args:
+            file_path (str): Destination JSON file path
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"results": self.records, "pairs": self.summary()}, f, ensure_ascii=False, indent=2)
@@ -1,12 +1,63 @@
+import threading
+
 from deep_translator import GoogleTranslator
 
-def translate_word(word, lang):
+# Longest text sent in one request (GoogleTranslator rejects more than 5000 characters)
+MAX_BATCH_CHARS = 4500
+
+# Translator clients are reused per (source, target). Each thread gets its own
+# clients because GoogleTranslator stores the text of a request on the instance.
+_clients = threading.local()
+
+
+class TranslationError(Exception):
+    """A translation request failed (raised only when strict=True)"""
+
+
+def get_translator(lang, source='auto'):
+    """
+       Get the translator client for a language pair, creating it on first use.
+
+       Args:
+           lang (str): Target language code (e.g., 'es', 'fr', 'de')
+           source (str, optional): Source language code. Defaults to 'auto' (detected on every request)
+
+       Returns:
+           GoogleTranslator: Client reused for every later call with the same languages
+
+       Example:
+           >>> get_translator("es") is get_translator("es")
+           True
+       """
+    translators = getattr(_clients, "translators", None)
+    if translators is None:
+        translators = _clients.translators = {}
+    key = (source, lang)
+    if key not in translators:
+        translators[key] = GoogleTranslator(source=source, target=lang)
+    return translators[key]
+
+
+def clear_translators():
+    """
+       Drop all cached translator clients, so the next calls create new ones.
+
+       Returns:
+           None
+       """
+    global _clients
+    _clients = threading.local()
+
+
+def translate_word(word, lang, source='auto', strict=False):
     """
        Translate a single word to the target language.
 
        Args:
            word (str): Word to translate
            lang (str): Target language code (e.g., 'es', 'fr', 'de')
+           source (str, optional): Source language code. Defaults to 'auto'
+           strict (bool, optional): Raise TranslationError instead of returning the original word. Defaults to False
 
        Returns:
            str: Translated word in lowercase, or original word if translation fails
@@ -14,29 +65,77 @@ def translate_word(word, lang):
        Example:
            >>> translate_word("hello", "es")
            'hola'
-           >>> translate_word("cat", "fr")
+           >>> translate_word("cat", "fr", source="en")
            'chat'
        """
     try:
-        return GoogleTranslator(source='auto', target=lang).translate(word).lower()
+        return get_translator(lang, source).translate(word).lower()
     except Exception as e:
+        if strict:
+            raise TranslationError(f"Error translating {word} to {lang}: {e}") from e
         print(f"Error translating {word} to {lang}: {e}")
         return word
 
-def translate_words(words, lang):
+
+def _batches(words):
+    batch, size = [], 0
+    for w in words:
+        if batch and size + len(w) + 1 > MAX_BATCH_CHARS:
+            yield batch
+            batch, size = [], 0
+        batch.append(w)
+        size += len(w) + 1
+    if batch:
+        yield batch
+
+
+def _translate_batch(words, lang, source):
+    # One word per line in a single request; None when the lines do not come
+    # back one-to-one, so the caller can fall back to word-by-word requests.
+    # A failed request (e.g. TooManyRequests) raises instead: retrying it word
+    # by word would only multiply the requests.
+    if len(words) < 2 or any("\n" in w for w in words):
+        return None
+    translated = get_translator(lang, source).translate("\n".join(words))
+    lines = translated.split("\n") if translated else []
+    if len(lines) != len(words) or not all(line.strip() for line in lines):
+        return None
+    return [line.strip().lower() for line in lines]
+
+
+def translate_words(words, lang, source='auto', strict=False):
     """
         Translate a list of words to the target language.
+        Words are sent together, one per line, in as few requests as possible;
+        a batch that does not come back line-for-line is retried word by word.
+        If a request fails, the remaining words are returned untranslated,
+        or TranslationError is raised when strict is set.
 
         Args:
             words (list): List of words to translate
             lang (str): Target language code (e.g., 'es', 'fr', 'de')
+            source (str, optional): Source language code. Defaults to 'auto'
+            strict (bool, optional): Raise TranslationError instead of returning untranslated words. Defaults to False
 
         Returns:
             list: List of translated words in the same order
 
         Example:
             >>> words = ["hello", "world", "cat"]
-            >>> translate_words(words, "es")
+            >>> translate_words(words, "es", source="en")
             ['hola', 'mundo', 'gato']
         """
-    return [translate_word(w, lang) for w in words]
\ No newline at end of file
+    translations = []
+    for batch in _batches(words):
+        try:
+            translated = _translate_batch(batch, lang, source)
+        except Exception as e:
+            untranslated = list(words[len(translations):])
+            if strict:
+                raise TranslationError(f"Error translating {len(untranslated)} words to {lang}: {e}") from e
+            print(f"Error translating {len(untranslated)} words to {lang}: {e}")
+            return translations + untranslated
+        if translated is None:
+            translated = [translate_word(w, lang, source, strict) for w in batch]
+        translations.extend(translated)
+    return translations
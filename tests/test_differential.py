@@ -0,0 +1,318 @@
+#Differential tests: every optimized path is compared with the plain reference computation
+import unittest
+import os
+import tempfile
+import shutil
+import csv
+import random
+import time
+import textdistance
+
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.fileUtils import get_words_from_file, save_similarity_matrix, save_sparse_similarity_matrix
+from src.utils.similarity import compute_similarity, sparse_similarities, clear_similarity_cache
+from src.utils.overall_similarity import diagonal_average
+from src.utils.pair_cache import similarity_matrix, clear_memory_cache
+from src.utils.similarity_report import SimilarityReport
+from src.service import AnalysisService
+
+# Fixed seed, so a failure can be reproduced
+SEED = 2024
+CASES = 40
+
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'results', 'translations')
+
+# Alphabets mixed into generated words: Latin, Polish/Nordic accents, Cyrillic,
+# Greek, combining marks, CJK and characters outside the Basic Multilingual Plane
+ALPHABETS = [
+    "abcdefghijklmnopqrstuvwxyz",
+    "ąćęłńóśźżåäöøæß",
+    "абвгдежзийклмнопрстуфхцчшщъыьэюяїієґ",
+    "αβγδεζηθικλμνξοπρστυφχψω",
+    "̧́̈",
+    "猫犬牛馬鳥魚",
+    "😀🐈🐕🍌",
+]
+
+
+def reference_similarity(word1, word2):
+    return textdistance.levenshtein.normalized_similarity(word1, word2)
+
+
+def reference_matrix(words1, words2):
+    return [[reference_similarity(w1, w2) for w2 in words2] for w1 in words1]
+
+
+def reference_diagonal_average(matrix):
+    diagonal = [matrix[i][i] for i in range(min(len(matrix), len(matrix[0]) if matrix else 0))]
+    return sum(diagonal) / len(diagonal) if diagonal else 0
+
+
+def random_word(rng):
+    kind = rng.random()
+    if kind < 0.05:
+        return ""
+    # Mostly one script, sometimes several mixed in one word
+    alphabet = "".join(rng.sample(ALPHABETS, rng.choice([1, 1, 1, 2, 3])))
+    length = rng.randint(30, 60) if kind > 0.95 else rng.randint(1, 10)
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def random_word_list(rng, size):
+    words = [random_word(rng) for _ in range(size)]
+    # Near-duplicates make high-similarity pairs, which thresholded paths must keep
+    for i in range(0, size, 3):
+        if words[i]:
+            position = rng.randrange(len(words[i]))
+            words[i] = words[i][:position] + words[i][position + 1:]
+    return words
+
+
+class TestDifferentialSimilarity(unittest.TestCase):
+    """compute_similarity and its fast paths against textdistance"""
+
+    def setUp(self):
+        self.rng = random.Random(SEED)
+        clear_similarity_cache()
+
+    def tearDown(self):
+        clear_similarity_cache()
+
+    def test_memoized_matches_reference(self):
+        """Cold and warm cache lookups, in both word orders"""
+        for _ in range(CASES):
+            words = random_word_list(self.rng, 12)
+            for w1 in words:
+                for w2 in words:
+                    expected = reference_similarity(w1, w2)
+                    self.assertEqual(compute_similarity(w1, w2), expected, (w1, w2))
+                    self.assertEqual(compute_similarity(w2, w1), expected, (w2, w1))
+
+    def test_min_score_matches_reference(self):
+        """Bounded edit distance keeps exactly the pairs reaching min_score"""
+        cutoffs = [0.0, 0.25, 1 / 3, 0.5, 2 / 3, 0.75, 0.9, 1.0]
+        for _ in range(CASES):
+            words = random_word_list(self.rng, 10)
+            for w1 in words:
+                for w2 in words:
+                    expected = reference_similarity(w1, w2)
+                    for min_score in cutoffs + [self.rng.random()]:
+                        # Cold cache every time, so the bounded kernel itself is checked
+                        clear_similarity_cache()
+                        result = compute_similarity(w1, w2, min_score=min_score)
+                        self.assertEqual(result, expected if expected >= min_score else None,
+                                         (w1, w2, min_score))
+
+    def test_sparse_matches_dense(self):
+        """Sparse output equals the dense matrix filtered by threshold and top-k"""
+        for _ in range(CASES):
+            words1 = random_word_list(self.rng, self.rng.randint(0, 15))
+            words2 = random_word_list(self.rng, self.rng.randint(0, 15))
+            dense = reference_matrix(words1, words2)
+            threshold = self.rng.choice([None, 0.0, 0.3, 0.5, self.rng.random()])
+            top_k = self.rng.choice([None, 1, 2, 5])
+
+            expected = []
+            for i, row in enumerate(dense):
+                kept = [(score, j) for j, score in enumerate(row) if threshold is None or score >= threshold]
+                kept.sort(key=lambda item: (-item[0], item[1]))
+                if top_k is not None:
+                    kept = kept[:top_k]
+                expected.extend(sorted((i, j, score) for score, j in kept))
+
+            clear_similarity_cache()
+            self.assertEqual(sparse_similarities(words1, words2, threshold, top_k), expected,
+                             (words1, words2, threshold, top_k))
+
+
+class TestDifferentialMatrices(unittest.TestCase):
+    """Cached matrices, diagonal averages and reports against direct computation"""
+
+    def setUp(self):
+        self.rng = random.Random(SEED)
+        self.test_dir = tempfile.mkdtemp()
+        clear_similarity_cache()
+        clear_memory_cache()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+        clear_similarity_cache()
+        clear_memory_cache()
+
+    def test_pair_cache_matches_reference(self):
+        """Canonical-order matrices served in both orders, from memory and from disk"""
+        for _ in range(CASES):
+            words1 = random_word_list(self.rng, self.rng.randint(1, 10))
+            words2 = random_word_list(self.rng, self.rng.randint(1, 10))
+            expected = reference_matrix(words1, words2)
+            transposed = reference_matrix(words2, words1)
+
+            self.assertEqual(similarity_matrix(words1, words2, self.test_dir), expected)
+            self.assertEqual(similarity_matrix(words2, words1, self.test_dir), transposed)
+            clear_memory_cache()
+            self.assertEqual(similarity_matrix(words2, words1, self.test_dir), transposed)
+            self.assertEqual(similarity_matrix(words1, words2, self.test_dir), expected)
+
+    def test_diagonal_average_matches_reference(self):
+        """diagonal_average on square, non-square and empty matrices"""
+        for _ in range(CASES):
+            words1 = random_word_list(self.rng, self.rng.randint(0, 10))
+            words2 = random_word_list(self.rng, self.rng.randint(1, 10))
+            matrix = reference_matrix(words1, words2)
+            self.assertEqual(diagonal_average(matrix), reference_diagonal_average(matrix))
+
+    def test_report_matches_reference(self):
+        """Running sums of the report against averages computed from all results at once"""
+        results = {}
+        report = SimilarityReport()
+        for topic in range(CASES):
+            for lang1, lang2 in [("en", "es"), ("pl", "es"), ("es", "en")]:
+                score, count = self.rng.random(), self.rng.randint(1, 100)
+                report.add_result(f"topic{topic}", lang1, lang2, score, count)
+                results.setdefault(tuple(sorted((lang1, lang2))), []).append((score, count))
+
+        for row in report.summary():
+            pair_results = results[(row["lang1"], row["lang2"])]
+            expected = sum(s * c for s, c in pair_results) / sum(c for _, c in pair_results)
+            self.assertAlmostEqual(row["weighted_average"], expected, places=12)
+            self.assertEqual(row["words"], sum(c for _, c in pair_results))
+
+    def test_service_scores_match_reference(self):
+        """Service scores against the diagonal average of the full matrix"""
+        for _ in range(5):
+            words = random_word_list(self.rng, 8)
+            # Fake backend: a deterministic word change per language
+            service = AnalysisService(self.test_dir, workers=1,
+                                      translate=lambda ws, lang, source: [w[::-1] + lang for w in ws])
+            result = service.compare_words(words, ["en", "es", "pl"])
+            service.shutdown()
+
+            for pair in result["pairs"]:
+                matrix = reference_matrix(result["translations"][pair["lang1"]],
+                                          result["translations"][pair["lang2"]])
+                self.assertEqual(pair["score"], reference_diagonal_average(matrix))
+
+
+class TestDifferentialFiles(unittest.TestCase):
+    """Saved CSV files against the values they were written from"""
+
+    def setUp(self):
+        self.rng = random.Random(SEED)
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_dense_and_sparse_csv_agree(self):
+        """Every sparse CSV line equals the matching cell of the dense CSV"""
+        for case in range(CASES):
+            words1 = random_word_list(self.rng, self.rng.randint(1, 10))
+            words2 = random_word_list(self.rng, self.rng.randint(1, 10))
+            matrix = reference_matrix(words1, words2)
+            dense_file = os.path.join(self.test_dir, f"dense_{case}.csv")
+            sparse_file = os.path.join(self.test_dir, f"sparse_{case}.csv")
+
+            save_similarity_matrix(words1, words2, matrix, dense_file)
+            save_sparse_similarity_matrix(words1, words2, sparse_similarities(words1, words2, 0.3), sparse_file)
+
+            with open(dense_file, "r", newline='', encoding="utf-8") as f:
+                dense_rows = list(csv.reader(f))
+            with open(sparse_file, "r", newline='', encoding="utf-8") as f:
+                sparse_rows = list(csv.reader(f))
+
+            self.assertEqual(dense_rows[0], [""] + words2)
+            self.assertEqual([row[0] for row in dense_rows[1:]], words1)
+            for i, row in enumerate(dense_rows[1:]):
+                self.assertEqual(row[1:], [f"{v:.2f}" for v in matrix[i]])
+
+            expected = [[str(i), str(j), words1[i], words2[j], f"{matrix[i][j]:.2f}"]
+                        for i in range(len(words1)) for j in range(len(words2)) if matrix[i][j] >= 0.3]
+            self.assertEqual(sparse_rows[1:], expected)
+            for i, j, w1, w2, value in sparse_rows[1:]:
+                self.assertEqual(dense_rows[int(i) + 1][int(j) + 1], value)
+
+
+def load_translations(lang, topics=("animals", "fruits")):
+    words = []
+    for topic in topics:
+        words += get_words_from_file(os.path.join(TRANSLATIONS_DIR, f"{topic}_{lang}.txt"))
+    return words
+
+
+def mutate(rng, word):
+    # One substituted letter: a near-duplicate that passes the length bound
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice("aeioulnrst") + word[position + 1:]
+
+
+class TestPerformanceSmoke(unittest.TestCase):
+    """
+    Fast paths must not be slower than the reference computation they replace.
+
+    Timed on real translation lists, so the pruned pairs look like production
+    ones: most Spanish/French pairs get past the length check to the histogram
+    bound, and the aligned pairs (translations of the same word plus
+    one-letter near-duplicates) almost all reach the banded edit distance.
+    """
+
+    def setUp(self):
+        rng = random.Random(SEED)
+        self.words1 = load_translations("es")
+        self.words2 = load_translations("fr")
+        self.aligned = list(zip(self.words1, self.words2))
+        self.aligned += [(w, mutate(rng, w)) for w in self.words1 + self.words2]
+        clear_similarity_cache()
+
+    def tearDown(self):
+        clear_similarity_cache()
+
+    def best_time(self, function, setup=None):
+        # Best of three runs, so a single hiccup of the machine does not fail the test
+        times = []
+        for _ in range(3):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def test_min_score_not_slower(self):
+        """Bounded edit distance against the full computation, on pairs that mostly pass"""
+        passing = sum(reference_similarity(w1, w2) >= 0.5 for w1, w2 in self.aligned)
+        # Guard against the data drifting back to pairs that exit before the DP
+        self.assertGreater(passing, len(self.aligned) * 0.6)
+
+        reference = self.best_time(lambda: [reference_similarity(w1, w2) for w1, w2 in self.aligned])
+        bounded = self.best_time(
+            lambda: [compute_similarity(w1, w2, min_score=0.5) for w1, w2 in self.aligned],
+            setup=clear_similarity_cache)
+        self.assertLessEqual(bounded, reference)
+
+    def test_sparse_not_slower(self):
+        """Pruned sparse output against the full matrix"""
+        past_length_check = sum(1 - abs(len(w1) - len(w2)) / max(len(w1), len(w2)) >= 0.5
+                                for w1 in self.words1 for w2 in self.words2)
+        # Most pairs must reach the histogram bound, not stop at the length check
+        self.assertGreater(past_length_check, len(self.words1) * len(self.words2) * 0.5)
+
+        reference = self.best_time(lambda: reference_matrix(self.words1, self.words2))
+        sparse = self.best_time(lambda: sparse_similarities(self.words1, self.words2, threshold=0.5),
+                                setup=clear_similarity_cache)
+        self.assertLessEqual(sparse, reference)
+
+    def test_cache_hits_not_slower(self):
+        """Warm word pair cache against the full computation"""
+        for w1 in self.words1:
+            for w2 in self.words2:
+                compute_similarity(w1, w2)
+        reference = self.best_time(lambda: reference_matrix(self.words1, self.words2))
+        cached = self.best_time(lambda: [[compute_similarity(w1, w2) for w2 in self.words2] for w1 in self.words1])
+        self.assertLessEqual(cached, reference)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
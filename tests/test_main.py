@@ -3,7 +3,13 @@ import unittest
 import os
 import tempfile
 import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
 import csv
+import json
+import textdistance
 from unittest.mock import patch, MagicMock
 
 # Import your modules
@@ -11,10 +17,17 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.utils.translate import translate_word, translate_words
-from src.utils.fileUtils import get_words_from_file, save_words_to_file, save_similarity_matrix
-from src.utils.similarity import compute_similarity
-from src.utils.overall_similarity import diagonal_average, add_connection
+from src.utils.translate import (translate_word, translate_words, get_translator, clear_translators,
+                                 TranslationError)
+from src.utils.fileUtils import (get_words_from_file, save_words_to_file, save_similarity_matrix,
+                                 save_sparse_similarity_matrix)
+from src.utils.similarity import (compute_similarity, sparse_similarities, similarity_cache_info,
+                                  clear_similarity_cache, enable_persistent_cache, disable_persistent_cache)
+from src.utils.overall_similarity import diagonal_average, similarity_average, add_connection
+from src.utils.similarity_report import SimilarityReport
+from src.utils.pair_cache import similarity_matrix, clear_memory_cache, clear_stored_matrices
+from src.service import AnalysisService, create_server
+from src.displayUtils import process_word_file, save_graph, _LAYOUT_CACHE
 
 
 
@@ -83,6 +96,22 @@ class TestFileUtils(unittest.TestCase):
         self.assertEqual(rows[1][0], "hello")
         self.assertEqual(rows[2][0], "world")
 
+    def test_save_sparse_similarity_matrix(self):
+        """Test saving sparse similarity pairs to CSV"""
+        words1 = ["hello", "world"]
+        words2 = ["hola", "mundo"]
+        entries = [(0, 0, 0.6), (1, 1, 0.4)]
+        test_file = os.path.join(self.test_dir, "matrix", "test_sparse.csv")
+
+        save_sparse_similarity_matrix(words1, words2, entries, test_file)
+
+        with open(test_file, "r", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+
+        self.assertEqual(rows[0], ["row", "col", "word1", "word2", "similarity"])
+        self.assertEqual(rows[1], ["0", "0", "hello", "hola", "0.60"])
+        self.assertEqual(rows[2], ["1", "1", "world", "mundo", "0.40"])
+
 
 class TestSimilarity(unittest.TestCase):
     """Test suite for similarity.py"""
@@ -109,6 +138,122 @@ class TestSimilarity(unittest.TestCase):
         sim2 = compute_similarity("hello", "hello")
         self.assertNotEqual(sim1, sim2)
 
+    def test_compute_similarity_min_score(self):
+        """Test that min_score returns exact scores above the cutoff and None below it"""
+        exact = compute_similarity("kitten", "sitting")
+
+        self.assertEqual(compute_similarity("kitten", "sitting", min_score=0.5), exact)
+        self.assertEqual(compute_similarity("kitten", "sitting", min_score=exact), exact)
+        self.assertIsNone(compute_similarity("kitten", "sitting", min_score=0.6))
+        self.assertIsNone(compute_similarity("abc", "xyz", min_score=0.1))
+        self.assertEqual(compute_similarity("", "", min_score=1.0), 1.0)
+
+    @patch('src.utils.similarity.textdistance.levenshtein.normalized_similarity')
+    def test_compute_similarity_min_score_skips_full_computation(self, mock_kernel):
+        """Test that thresholded queries never run the full Levenshtein computation"""
+        clear_similarity_cache()
+
+        self.assertIsNone(compute_similarity("elephant", "relevant", min_score=0.9))
+        self.assertEqual(compute_similarity("banana", "bananas", min_score=0.8), 1 - 1 / 7)
+        mock_kernel.assert_not_called()
+
+    def test_sparse_similarities_threshold(self):
+        """Test that sparse output keeps exactly the pairs above the threshold"""
+        words1 = ["kitten", "cat", "banana"]
+        words2 = ["sitting", "cut", "bandana", "x"]
+
+        entries = sparse_similarities(words1, words2, threshold=0.5)
+
+        expected = [(i, j, compute_similarity(w1, w2))
+                    for i, w1 in enumerate(words1) for j, w2 in enumerate(words2)
+                    if compute_similarity(w1, w2) >= 0.5]
+        self.assertEqual(entries, expected)
+
+    def test_sparse_similarities_top_k(self):
+        """Test that sparse output keeps the best pairs of each row"""
+        words1 = ["cat", "dog"]
+        words2 = ["cut", "dig", "cot", "dog"]
+
+        entries = sparse_similarities(words1, words2, top_k=1)
+
+        # Ties go to the lower column index
+        self.assertEqual(entries, [(0, 0, compute_similarity("cat", "cut")), (1, 3, 1.0)])
+
+
+class TestSimilarityCache(unittest.TestCase):
+    """Test suite for the word pair cache in similarity.py"""
+
+    def setUp(self):
+        """Create a temporary directory and start with an empty cache"""
+        self.test_dir = tempfile.mkdtemp()
+        clear_similarity_cache()
+
+    def tearDown(self):
+        """Close the persistent cache and remove the temporary directory"""
+        disable_persistent_cache()
+        clear_similarity_cache()
+        shutil.rmtree(self.test_dir)
+
+    def test_cache_hits_in_both_orders(self):
+        """Test that a pair is computed once, whichever word comes first"""
+        first = compute_similarity("banana", "banane")
+        second = compute_similarity("banane", "banana")
+
+        info = similarity_cache_info()
+        self.assertEqual(first, second)
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (1, 1, 1))
+        self.assertEqual(info["hit_rate"], 0.5)
+
+    @patch('src.utils.similarity.textdistance.levenshtein.normalized_similarity', return_value=0.5)
+    def test_cached_pair_skips_kernel(self, mock_kernel):
+        """Test that hot pairs do not reach the Levenshtein computation"""
+        for _ in range(3):
+            compute_similarity("kitten", "sitting")
+
+        self.assertEqual(mock_kernel.call_count, 1)
+
+    def test_non_string_sequences(self):
+        """Test that sequences other than str are still accepted, as textdistance accepts them"""
+        expected = textdistance.levenshtein.normalized_similarity(["a", "b"], ["a", "c"])
+
+        self.assertEqual(compute_similarity(["a", "b"], ["a", "c"]), expected)
+        self.assertEqual(compute_similarity(("a", "b"), ("a", "c")), expected)
+        self.assertEqual(compute_similarity(("a", "b"), ("a", "c")), expected)
+
+    def test_persistent_cache(self):
+        """Test that pairs are reused from the persistent cache after memory is cleared"""
+        db_file = os.path.join(self.test_dir, "similarities.sqlite3")
+        enable_persistent_cache(db_file)
+        expected = compute_similarity("kitten", "sitting")
+        disable_persistent_cache()
+
+        clear_similarity_cache()
+        enable_persistent_cache(db_file)
+        with patch('src.utils.similarity.textdistance.levenshtein.normalized_similarity') as mock_kernel:
+            result = compute_similarity("sitting", "kitten")
+
+        self.assertEqual(result, expected)
+        mock_kernel.assert_not_called()
+        self.assertEqual(similarity_cache_info()["persistent_hits"], 1)
+
+    @patch('src.utils.similarity.MAX_PERSISTENT_PAIRS', 2)
+    @patch('src.utils.similarity.PERSISTENT_BATCH_SIZE', 1)
+    def test_persistent_cache_size(self):
+        """Test that the persistent cache keeps only the most recently written pairs"""
+        db_file = os.path.join(self.test_dir, "similarities.sqlite3")
+        enable_persistent_cache(db_file)
+        for word in ["cat", "dog", "cow"]:
+            compute_similarity(word, "bird")
+        disable_persistent_cache()
+
+        clear_similarity_cache()
+        enable_persistent_cache(db_file)
+        compute_similarity("cat", "bird")
+        compute_similarity("cow", "bird")
+
+        info = similarity_cache_info()
+        self.assertEqual((info["persistent_hits"], info["misses"]), (1, 1))
+
 
 class TestOverallSimilarity(unittest.TestCase):
     """Test suite for overall_similarity.py"""
@@ -140,6 +285,15 @@ class TestOverallSimilarity(unittest.TestCase):
         avg = diagonal_average(matrix)
         self.assertEqual(avg, 0)
 
+    def test_similarity_average(self):
+        """Test that the diagonal-only average matches diagonal_average"""
+        matrix = [
+            [0.8, 0.5, 0.3],
+            [0.5, 0.9, 0.6]
+        ]
+        self.assertEqual(similarity_average([0.8, 0.9]), diagonal_average(matrix))
+        self.assertEqual(similarity_average([]), 0)
+
     def test_add_connection(self):
         """Test adding connection to graph"""
         import networkx as nx
@@ -153,9 +307,165 @@ class TestOverallSimilarity(unittest.TestCase):
         self.assertEqual(G["en"]["pl"]["label"], 85.5)
 
 
+class TestPairCache(unittest.TestCase):
+    """Test suite for pair_cache.py"""
+
+    def setUp(self):
+        """Create a temporary directory and start with an empty memory cache"""
+        self.test_dir = tempfile.mkdtemp()
+        clear_memory_cache()
+
+    def tearDown(self):
+        """Remove the temporary directory after tests"""
+        shutil.rmtree(self.test_dir)
+        clear_memory_cache()
+
+    def test_matrix_matches_direct_computation(self):
+        """Test that cached matrices equal the word-by-word computation in both orders"""
+        words_pl = ["kot", "pies", "krowa"]
+        words_es = ["gato", "perro"]
+
+        matrix = similarity_matrix(words_pl, words_es)
+        reverse = similarity_matrix(words_es, words_pl)
+
+        self.assertEqual(matrix, [[compute_similarity(w1, w2) for w2 in words_es] for w1 in words_pl])
+        self.assertEqual(reverse, [[compute_similarity(w1, w2) for w2 in words_pl] for w1 in words_es])
+
+    @patch('src.utils.pair_cache.compute_similarity', side_effect=compute_similarity)
+    def test_reverse_order_reused(self, mock_similarity):
+        """Test that the reverse language order is served without recomputing"""
+        similarity_matrix(["kot", "pies"], ["gato", "perro", "vaca"])
+        similarity_matrix(["gato", "perro", "vaca"], ["kot", "pies"])
+
+        self.assertEqual(mock_similarity.call_count, 6)
+
+    @patch('src.utils.pair_cache.compute_similarity', side_effect=compute_similarity)
+    def test_reused_across_runs(self, mock_similarity):
+        """Test that stored matrices are reused after the memory cache is gone"""
+        first = similarity_matrix(["kot", "pies"], ["gato", "perro"], self.test_dir)
+        clear_memory_cache()
+        second = similarity_matrix(["gato", "perro"], ["kot", "pies"], self.test_dir)
+
+        self.assertEqual(mock_similarity.call_count, 4)
+        self.assertEqual(second, [list(column) for column in zip(*first)])
+
+
+    @patch('src.utils.pair_cache.MAX_STORED_MATRICES', 2)
+    def test_stored_matrices_capped(self):
+        """Test that the least recently used files are deleted beyond the limit"""
+        for words in (["kot"], ["pies"], ["krowa"]):
+            similarity_matrix(words, ["gato"], self.test_dir)
+            time.sleep(0.01)
+
+        self.assertEqual(len(os.listdir(self.test_dir)), 2)
+        self.assertEqual(clear_stored_matrices(self.test_dir), 2)
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+
+class TestSimilarityReport(unittest.TestCase):
+    """Test suite for similarity_report.py"""
+
+    def setUp(self):
+        """Create a temporary directory for testing"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary directory after tests"""
+        shutil.rmtree(self.test_dir)
+
+    def test_summary_weighted_average_and_ranking(self):
+        """Test that pairs are merged regardless of order, weighted and ranked"""
+        report = SimilarityReport()
+        report.add_result("animals", "en", "es", 0.4, 30)
+        report.add_result("fruits", "es", "en", 0.6, 10)
+        report.add_result("animals", "es", "pl", 0.2, 30)
+
+        summary = report.summary()
+
+        self.assertEqual([(row["lang1"], row["lang2"]) for row in summary], [("en", "es"), ("es", "pl")])
+        self.assertEqual([row["rank"] for row in summary], [1, 2])
+        self.assertAlmostEqual(summary[0]["weighted_average"], (0.4 * 30 + 0.6 * 10) / 40)
+        self.assertEqual(summary[0]["topics"], 2)
+        self.assertEqual(summary[0]["words"], 40)
+        self.assertLess(summary[0]["ci_low"], summary[0]["weighted_average"])
+        self.assertGreater(summary[0]["ci_high"], summary[0]["weighted_average"])
+
+    def test_summary_confidence_interval(self):
+        """Test the interval against the unbiased standard error and t quantile"""
+        report = SimilarityReport()
+        for topic, score in [("animals", 0.4), ("fruits", 0.5), ("buildings", 0.6)]:
+            report.add_result(topic, "en", "es", score, 20)
+
+        row = report.summary()[0]
+
+        # Sample standard deviation 0.1 over 3 topics, t quantile for 2 degrees of freedom
+        margin = 4.303 * 0.1 / 3 ** 0.5
+        self.assertAlmostEqual(row["ci_low"], 0.5 - margin)
+        self.assertAlmostEqual(row["ci_high"], 0.5 + margin)
+
+    def test_summary_single_topic_has_no_interval(self):
+        """Test that a pair seen in a single topic has no confidence interval"""
+        report = SimilarityReport()
+        report.add_result("animals", "en", "es", 0.4, 30)
+
+        row = report.summary()[0]
+
+        self.assertIsNone(row["ci_low"])
+        self.assertIsNone(row["ci_high"])
+
+    def test_failed_topic_not_reported(self):
+        """Test that a topic adds its scores to the report only when it is fully processed"""
+        input_file = os.path.join(self.test_dir, "animals.txt")
+        with open(input_file, "w", encoding="utf-8") as f:
+            f.write("cat\ndog\n")
+        fake_translate = lambda words, lang, source: [w + lang for w in words]
+        report = SimilarityReport()
+
+        with patch('src.displayUtils.save_graph', side_effect=RuntimeError("drawing failed")):
+            success = process_word_file(input_file, ["en", "es", "pl"], self.test_dir,
+                                        report=report, translate=fake_translate)
+        self.assertFalse(success)
+        self.assertEqual(report.records, [])
+
+        with patch('src.displayUtils.save_graph'):
+            success = process_word_file(input_file, ["en", "es", "pl"], self.test_dir,
+                                        report=report, translate=fake_translate)
+        self.assertTrue(success)
+        self.assertEqual(len(report.records), 3)
+
+    def test_save_csv_and_json(self):
+        """Test saving the aggregated report"""
+        report = SimilarityReport()
+        report.add_result("animals", "en", "es", 0.4, 30)
+        report.add_result("fruits", "en", "es", 0.6, 10)
+        csv_file = os.path.join(self.test_dir, "overall_similarity.csv")
+        json_file = os.path.join(self.test_dir, "overall_similarity.json")
+
+        report.save_csv(csv_file)
+        report.save_json(json_file)
+
+        with open(csv_file, "r", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][:5], ["rank", "lang1", "lang2", "topics", "words"])
+        self.assertEqual(rows[1][:6], ["1", "en", "es", "2", "40", "0.4500"])
+
+        with open(json_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(len(data["results"]), 2)
+        self.assertEqual(data["pairs"][0]["rank"], 1)
+
+
 class TestTranslate(unittest.TestCase):
     """Test suite for translate.py"""
 
+    def setUp(self):
+        """Start every test without cached translator clients"""
+        clear_translators()
+
+    def tearDown(self):
+        """Do not leak mocked clients into other tests"""
+        clear_translators()
+
     @patch('src.utils.translate.GoogleTranslator')
     def test_translate_word_success(self, mock_translator):
         """Test successful word translation"""
@@ -181,10 +491,11 @@ class TestTranslate(unittest.TestCase):
         # Should return original word on error
         self.assertEqual(result, "hello")
 
+    @patch('src.utils.translate._translate_batch', return_value=None)
     @patch('src.utils.translate.translate_word')
-    def test_translate_words(self, mock_translate):
-        """Test translating multiple words"""
-        mock_translate.side_effect = lambda w, l: f"{w}_translated"
+    def test_translate_words(self, mock_translate, mock_batch):
+        """Test translating multiple words word by word when batching fails"""
+        mock_translate.side_effect = lambda w, l, s, strict: f"{w}_translated"
 
         words = ["hello", "world", "test"]
         result = translate_words(words, "es")
@@ -193,6 +504,199 @@ class TestTranslate(unittest.TestCase):
         self.assertEqual(result, expected)
         self.assertEqual(mock_translate.call_count, 3)
 
+    @patch('src.utils.translate.GoogleTranslator')
+    def test_translate_words_batch(self, mock_translator):
+        """Test that words are translated in one request, one per line"""
+        mock_instance = MagicMock()
+        mock_instance.translate.return_value = "Hola\nMundo"
+        mock_translator.return_value = mock_instance
+
+        result = translate_words(["hello", "world"], "es", source="en")
+
+        self.assertEqual(result, ["hola", "mundo"])
+        mock_translator.assert_called_once_with(source='en', target='es')
+        mock_instance.translate.assert_called_once_with("hello\nworld")
+
+    @patch('src.utils.translate.GoogleTranslator')
+    def test_translate_words_batch_mismatch(self, mock_translator):
+        """Test falling back to single words when lines do not come back one-to-one"""
+        mock_instance = MagicMock()
+        mock_instance.translate.side_effect = ["Hola mundo", "Hola", "Mundo"]
+        mock_translator.return_value = mock_instance
+
+        result = translate_words(["hello", "world"], "es")
+
+        self.assertEqual(result, ["hola", "mundo"])
+        self.assertEqual(mock_instance.translate.call_count, 3)
+
+    @patch('src.utils.translate.GoogleTranslator')
+    def test_translate_words_batch_request_failure(self, mock_translator):
+        """Test that a failed batch request is not retried word by word"""
+        mock_instance = MagicMock()
+        mock_instance.translate.side_effect = Exception("Too many requests")
+        mock_translator.return_value = mock_instance
+
+        result = translate_words(["hello", "world", "cat"], "es")
+
+        self.assertEqual(result, ["hello", "world", "cat"])
+        self.assertEqual(mock_instance.translate.call_count, 1)
+
+    @patch('src.utils.translate.GoogleTranslator')
+    def test_translate_words_strict(self, mock_translator):
+        """Test that strict mode raises instead of returning untranslated words"""
+        mock_instance = MagicMock()
+        mock_instance.translate.side_effect = Exception("Too many requests")
+        mock_translator.return_value = mock_instance
+
+        with self.assertRaises(TranslationError):
+            translate_words(["hello", "world"], "es", strict=True)
+        with self.assertRaises(TranslationError):
+            translate_words(["hello"], "es", strict=True)
+
+    @patch('src.utils.translate.GoogleTranslator')
+    def test_translator_reused(self, mock_translator):
+        """Test that one client is created per language pair"""
+        mock_translator.side_effect = lambda source, target: MagicMock()
+
+        self.assertIs(get_translator("es"), get_translator("es"))
+        self.assertIsNot(get_translator("es"), get_translator("es", source="en"))
+        self.assertEqual(mock_translator.call_count, 2)
+
+
+class TestService(unittest.TestCase):
+    """Test suite for service.py, using a fake translation backend"""
+
+    def setUp(self):
+        """Start the service on a free port"""
+        self.test_dir = tempfile.mkdtemp()
+        self.backend_calls = []
+        self.backend_error = None
+
+        def fake_translate(words, lang, source):
+            self.backend_calls.append((list(words), lang))
+            if self.backend_error:
+                raise self.backend_error
+            return [f"{w}{lang}" for w in words]
+
+        self.service = AnalysisService(self.test_dir, workers=2, translate=fake_translate, data_dir=self.test_dir)
+        self.server = create_server(self.service, port=0)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        """Stop the service and remove the temporary directory"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.shutdown()
+        shutil.rmtree(self.test_dir)
+
+    def post(self, path, data):
+        request = urllib.request.Request(self.url + path, data=json.dumps(data).encode("utf-8"),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def test_similarity_endpoint(self):
+        """Test scoring a word list through the API"""
+        result = self.post("/similarity", {"words": ["cat", "dog"], "languages": ["en", "es"]})
+
+        self.assertEqual(result["translations"]["es"], ["cates", "doges"])
+        self.assertEqual(len(result["pairs"]), 1)
+        pair = result["pairs"][0]
+        self.assertEqual((pair["lang1"], pair["lang2"]), ("en", "es"))
+        self.assertAlmostEqual(pair["score"], compute_similarity("caten", "cates"))
+
+    def test_translations_stay_warm(self):
+        """Test that repeated words are not sent to the backend again"""
+        self.post("/similarity", {"words": ["cat", "dog"], "languages": ["en", "es"]})
+        self.post("/similarity", {"words": ["dog", "cow"], "languages": ["es", "en"]})
+
+        self.assertEqual(sorted(self.backend_calls),
+                         [(["cat", "dog"], "en"), (["cat", "dog"], "es"), (["cow"], "en"), (["cow"], "es")])
+
+    def test_invalid_request(self):
+        """Test that invalid language selections are rejected"""
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post("/similarity", {"words": ["cat"], "languages": ["en"]})
+        self.assertEqual(context.exception.code, 400)
+
+    @patch('src.service.MAX_CACHED_TRANSLATIONS', 2)
+    def test_translation_cache_size(self):
+        """Test that only the most recently used translations are remembered"""
+        self.service.translate(["cat", "dog"], "es")
+        self.service.translate(["cat"], "es")
+        self.service.translate(["cow"], "es")
+        self.service.translate(["cat", "dog"], "es")
+
+        self.assertEqual(self.backend_calls, [(["cat", "dog"], "es"), (["cow"], "es"), (["dog"], "es")])
+
+    @patch('src.displayUtils.MAX_CACHED_LAYOUTS', 1)
+    def test_layout_cache_size(self):
+        """Test that graph layouts are not kept for every language set"""
+        import networkx as nx
+        for languages in [("en", "es"), ("en", "pl")]:
+            G = nx.Graph()
+            add_connection(G, *languages, "50%")
+            save_graph(G, "test", os.path.join(self.test_dir, "graph.png"))
+
+        self.assertEqual(list(_LAYOUT_CACHE), [(("en", "pl"), (("en", "pl"),))])
+
+    def test_too_many_languages(self):
+        """Test that requests are limited to the languages of the interactive selection"""
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post("/similarity", {"words": ["cat"], "languages": ["en", "es", "pl", "de", "fr"]})
+        self.assertEqual(context.exception.code, 400)
+
+    def test_translation_failure(self):
+        """Test that a failed translation is answered with 502 and not remembered"""
+        self.backend_error = TranslationError("Too many requests")
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.post("/similarity", {"words": ["cat", "dog"], "languages": ["en", "es"]})
+        self.assertEqual(context.exception.code, 502)
+
+        self.backend_error = None
+        result = self.post("/similarity", {"words": ["cat", "dog"], "languages": ["en", "es"]})
+
+        self.assertEqual(result["translations"]["es"], ["cates", "doges"])
+        # The words that failed are requested again
+        self.assertEqual(self.backend_calls, [(["cat", "dog"], "en"), (["cat", "dog"], "en"),
+                                              (["cat", "dog"], "es")])
+
+    def test_process_endpoint(self):
+        """Test processing a word file through the API"""
+        input_file = os.path.join(self.test_dir, "animals.txt")
+        with open(input_file, "w", encoding="utf-8") as f:
+            f.write("cat\ndog\n")
+
+        result = self.post("/process", {"file": input_file, "languages": ["en", "pl"]})
+
+        self.assertTrue(result["success"])
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "similarities", "animals_en_pl.csv")))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "animals_similarity_graph.png")))
+
+    def test_process_relative_path(self):
+        """Test that relative file paths are looked up in the data directory"""
+        with open(os.path.join(self.test_dir, "fruits.txt"), "w", encoding="utf-8") as f:
+            f.write("apple\n")
+
+        result = self.post("/process", {"file": "fruits.txt", "languages": ["en", "pl"]})
+
+        self.assertTrue(result["success"])
+
+    def test_process_outside_data_dir(self):
+        """Test that files outside the data directory are rejected"""
+        other_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other_dir)
+        outside_file = os.path.join(other_dir, "secret.txt")
+        with open(outside_file, "w", encoding="utf-8") as f:
+            f.write("password\n")
+
+        for path in [outside_file, os.path.join("..", os.path.basename(other_dir), "secret.txt")]:
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self.post("/process", {"file": path, "languages": ["en", "pl"]})
+            self.assertEqual(context.exception.code, 403)
+        self.assertEqual(self.backend_calls, [])
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests for the full workflow"""
@@ -251,8 +755,12 @@ def run_tests():
     # Add all test classes
     suite.addTests(loader.loadTestsFromTestCase(TestFileUtils))
     suite.addTests(loader.loadTestsFromTestCase(TestSimilarity))
+    suite.addTests(loader.loadTestsFromTestCase(TestSimilarityCache))
     suite.addTests(loader.loadTestsFromTestCase(TestOverallSimilarity))
+    suite.addTests(loader.loadTestsFromTestCase(TestPairCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestSimilarityReport))
     suite.addTests(loader.loadTestsFromTestCase(TestTranslate))
+    suite.addTests(loader.loadTestsFromTestCase(TestService))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
 
     runner = unittest.TextTestRunner(verbosity=2)